@@ -1,4 +1,6 @@
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -15,6 +17,19 @@ class Settings(BaseSettings):
     CACHE_MAX_SIZE: int = 128
     CACHE_TTL: int = 900
 
+    # Peran proses terhadap data stasiun:
+    # - "standalone": proses tunggal, scrape dan jadwalkan update sendiri
+    # - "worker": hanya membaca snapshot yang diterbitkan leader (diatur otomatis oleh gunicorn.conf.py)
+    STATION_ROLE: Literal["standalone", "worker"] = "standalone"
+    # Lokasi snapshot stasiun yang dibagikan leader ke para worker
+    STATION_SNAPSHOT_FILE: str = "stations.snapshot"
+    # Interval (detik) worker memeriksa versi snapshot terbaru
+    STATION_SNAPSHOT_CHECK_INTERVAL: int = 5
+    # Interval (jam) update daftar stasiun dari KAI
+    STATION_UPDATE_INTERVAL_HOURS: int = 24
+    # Interval (menit) updater mencoba ulang selama snapshot belum pernah berhasil diterbitkan
+    STATION_RETRY_INTERVAL_MINUTES: int = 5
+
     # Level logging aplikasi (misal: DEBUG, INFO, WARNING, ERROR)
     LOG_LEVEL: str = "INFO"
 
@@ -0,0 +1,67 @@
+# gunicorn.conf.py
+#
+# Mode multi-worker: proses master gunicorn bertindak sebagai leader yang
+# mengambil daftar stasiun dan menerbitkan file snapshot berversi. Setiap worker
+# hanya membaca snapshot tersebut (dan menyimpan salinan parse-nya sendiri),
+# sehingga hanya ada satu scheduler dan satu scraping stasiun berapapun jumlah
+# worker-nya.
+#
+# Snapshot awal diterbitkan langsung di master sebelum worker di-fork. Update
+# periodik berjalan di proses updater terpisah (interpreter Python baru), bukan
+# di thread master: master tetap single-threaded sehingga fork worker baru
+# (restart, timeout, max_requests, HUP) tidak pernah terjadi saat ada thread
+# lain yang sedang memegang lock.
+#
+# Jangan aktifkan `preload_app`: worker harus mengimpor main.py setelah fork
+# agar StationManager dibuat dengan peran "worker".
+
+import os
+import subprocess
+import sys
+
+bind = "0.0.0.0:8000"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+def on_starting(server):
+    """
+    Dijalankan sekali di proses master: terbitkan snapshot awal dan jalankan proses updater tunggal.
+    """
+    from config import settings
+    from logging_config import setup_logging
+    from station_snapshot import publish_station_snapshot
+
+    # Kegagalan leader tidak boleh menggagalkan start seluruh pool worker
+    setup_logging(log_level=settings.LOG_LEVEL)
+    try:
+        publish_station_snapshot()
+    except Exception as e:
+        server.log.error("Failed to publish initial station snapshot: %s", e)
+    try:
+        # Proses baru (bukan fork) agar updater tidak mewarisi state master.
+        # Handle disimpan di objek arbiter karena file config ini dieksekusi ulang saat HUP.
+        server.station_updater = subprocess.Popen([
+            sys.executable, "-c",
+            f"from station_snapshot import run_station_updater; run_station_updater({os.getpid()})",
+        ])
+    except Exception as e:
+        server.log.error("Failed to start station updater: %s", e)
+
+
+def post_fork(server, worker):
+    """
+    Tandai proses hasil fork sebagai worker sebelum main.py diimpor.
+    """
+    from config import settings
+
+    settings.STATION_ROLE = "worker"
+
+
+def on_exit(server):
+    updater = getattr(server, "station_updater", None)
+    if updater is not None and updater.poll() is None:
+        updater.terminate()
+        try:
+            updater.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            updater.kill()
@@ -91,13 +91,19 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # ====================
 @app.on_event("startup")
 async def startup_event():
+    if station_manager.is_worker:
+        # Pada mode multi-worker, update stasiun dan scheduler hanya berjalan di proses leader
+        logger.info("Running as worker. Station list is served from the leader snapshot.")
+        return
     station_manager.update_station_list()
-    scheduler.add_job(station_manager.update_station_list, 'interval', hours=24)
+    scheduler.add_job(station_manager.update_station_list, 'interval', hours=settings.STATION_UPDATE_INTERVAL_HOURS)
     scheduler.start()
     logger.info("Scheduler started. Station list will be updated periodically.")
 
 @app.on_event("shutdown")
 def shutdown_event():
+    if not scheduler.running:
+        return
     scheduler.shutdown()
     logger.info("Scheduler shut down.")
 
@@ -1,28 +1,63 @@
-
 import json
-from pathlib import Path
+import struct
 import structlog
 from typing import List, Dict, Optional
 
 from config import settings
-from kai_scraper import KAIScraper
+from station_snapshot import (
+    STATIONS_FILE,
+    StationSnapshot,
+    fetch_station_list,
+    save_station_list,
+)
 
 logger = structlog.get_logger()
-STATIONS_FILE = Path("stations.json")
 
 class StationManager:
     """
     Manajer data stasiun: memuat, mencari, validasi, dan update data stasiun KAI.
+    Pada peran "worker", data dibaca dari snapshot yang diterbitkan proses leader (lihat gunicorn.conf.py).
     """
-    def __init__(self):
+    def __init__(self, role: Optional[str] = None):
+        self._role = role or settings.STATION_ROLE
+        self._snapshot: Optional[StationSnapshot] = StationSnapshot() if self.is_worker else None
         self._stations: List[Dict] = []
         self._station_codes: set = set()
         self.load_stations()
 
+    @property
+    def is_worker(self) -> bool:
+        """
+        True jika instance ini hanya membaca snapshot dari proses leader.
+        """
+        return self._role == "worker"
+
+    def _sync_snapshot(self, force: bool = False):
+        """
+        Memuat ulang data dari snapshot leader jika versinya berubah (hanya pada peran worker).
+        """
+        if self._snapshot is None:
+            return
+        try:
+            stations = self._snapshot.refresh(force=force)
+        except (OSError, ValueError, struct.error) as e:
+            logger.error("Failed to read station snapshot.", error=str(e))
+            return
+        if stations is None:
+            return
+        self._stations = stations
+        self._station_codes = {s["code"].upper() for s in self._stations}
+        logger.info("Loaded station snapshot.", version=self._snapshot.version, count=len(self._stations))
+
     def load_stations(self):
         """
         Memuat daftar stasiun dari file JSON lokal. Jika file tidak ada atau rusak, akan mencoba update otomatis.
         """
+        if self.is_worker:
+            self._sync_snapshot(force=True)
+            if not self._stations:
+                logger.warn("Station snapshot not available yet. Waiting for leader to publish it.")
+            return
         if not STATIONS_FILE.exists():
             logger.warn("stations.json not found. Attempting to fetch it now.")
             self.update_station_list()
@@ -40,12 +75,14 @@ class StationManager:
         """
         Mengembalikan seluruh data stasiun yang tersedia.
         """
+        self._sync_snapshot()
         return self._stations
 
     def search_stations(self, query: str) -> List[Dict]:
         """
         Cari stasiun berdasarkan nama, kode, atau nama kota/kabupaten (case-insensitive).
         """
+        self._sync_snapshot()
         query = query.lower()
         return [
             s for s in self._stations
@@ -58,31 +95,28 @@ class StationManager:
         """
         Cek apakah kode stasiun valid (ada di data).
         """
+        self._sync_snapshot()
         return code.upper() in self._station_codes
 
     def update_station_list(self):
         """
         Mengambil daftar stasiun terbaru dari API KAI dan menyimpannya ke file lokal.
-        Fungsi ini dipanggil periodik oleh scheduler.
+        Fungsi ini dipanggil periodik oleh scheduler. Pada peran worker, hanya memuat ulang snapshot.
         """
-        logger.info("Attempting to fetch latest station list from KAI...")
+        if self.is_worker:
+            self._sync_snapshot(force=True)
+            return
+        new_stations = fetch_station_list()
+        if new_stations is None:
+            return
         try:
-            # Gunakan session dari KAIScraper yang sudah "di-pemanasan"
-            scraper_session = KAIScraper().scraper
-            stations_url = f"{settings.KAI_BASE_URL}/api/stations2"
-            response = scraper_session.post(stations_url, timeout=settings.REQUEST_TIMEOUT)
-            response.raise_for_status()
-            new_stations = response.json()
-            if not isinstance(new_stations, list) or not all("code" in s and "name" in s for s in new_stations):
-                logger.error("Fetched station data is not in the expected format.")
-                return
-            with open(STATIONS_FILE, "w", encoding='utf-8') as f:
-                json.dump(new_stations, f, indent=2, ensure_ascii=False)
-            self._stations = new_stations
-            self._station_codes = {s["code"].upper() for s in self._stations}
-            logger.info("Successfully updated and saved new station list.", count=len(self._stations))
-        except Exception as e:
-            logger.error("Failed to update station list.", error=str(e), exc_info=True)
+            save_station_list(new_stations)
+        except OSError as e:
+            logger.error("Failed to save station list.", error=str(e), exc_info=True)
+            return
+        self._stations = new_stations
+        self._station_codes = {s["code"].upper() for s in self._stations}
+        logger.info("Successfully updated and saved new station list.", count=len(self._stations))
 
 # Instance global yang digunakan aplikasi
 station_manager = StationManager()
\ No newline at end of file
@@ -0,0 +1,191 @@
+import json
+import os
+import struct
+import time
+from pathlib import Path
+from typing import List, Dict, Optional
+
+import structlog
+
+from config import settings
+
+logger = structlog.get_logger()
+STATIONS_FILE = Path("stations.json")
+SNAPSHOT_FILE = Path(settings.STATION_SNAPSHOT_FILE)
+
+# Header snapshot: magic, versi, panjang payload JSON (little-endian)
+_MAGIC = b"KAISTN01"
+_HEADER = struct.Struct("<8sQQ")
+
+
+def fetch_station_list() -> Optional[List[Dict]]:
+    """
+    Mengambil daftar stasiun terbaru dari API KAI.
+    Mengembalikan None jika gagal atau format data tidak sesuai.
+    """
+    # Import lokal agar proses leader gunicorn tidak perlu memuat scraper sebelum dibutuhkan
+    from kai_scraper import KAIScraper
+
+    logger.info("Attempting to fetch latest station list from KAI...")
+    try:
+        # Gunakan session dari KAIScraper yang sudah "di-pemanasan"
+        scraper_session = KAIScraper().scraper
+        stations_url = f"{settings.KAI_BASE_URL}/api/stations2"
+        response = scraper_session.post(stations_url, timeout=settings.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        new_stations = response.json()
+    except Exception as e:
+        logger.error("Failed to fetch station list.", error=str(e), exc_info=True)
+        return None
+    if not isinstance(new_stations, list) or not all("code" in s and "name" in s for s in new_stations):
+        logger.error("Fetched station data is not in the expected format.")
+        return None
+    return new_stations
+
+
+def save_station_list(stations: List[Dict]):
+    """
+    Menyimpan daftar stasiun ke file JSON lokal.
+    """
+    with open(STATIONS_FILE, "w", encoding='utf-8') as f:
+        json.dump(stations, f, indent=2, ensure_ascii=False)
+
+
+def _read_snapshot_version(path: Path) -> int:
+    """
+    Membaca versi snapshot yang ada di disk, 0 jika belum ada atau tidak valid.
+    """
+    try:
+        with open(path, "rb") as f:
+            magic, version, _ = _HEADER.unpack(f.read(_HEADER.size))
+    except (OSError, struct.error):
+        return 0
+    return version if magic == _MAGIC else 0
+
+
+def write_snapshot(stations: List[Dict], path: Path = SNAPSHOT_FILE) -> int:
+    """
+    Menulis snapshot stasiun secara atomik (tulis ke file sementara lalu rename).
+    Worker yang sedang membaca snapshot lama tidak terganggu. Mengembalikan versi baru.
+    """
+    version = _read_snapshot_version(path) + 1
+    payload = json.dumps(stations, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, version, len(payload)))
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return version
+
+
+def publish_station_snapshot():
+    """
+    Dijalankan oleh proses leader: ambil daftar stasiun terbaru lalu terbitkan snapshot untuk worker.
+    Jika scraping gagal dan snapshot belum ada, snapshot dibuat dari stations.json lokal.
+    Kegagalan menulis file hanya dicatat ke log, tidak pernah dilempar ke pemanggil.
+    """
+    stations = fetch_station_list()
+    if stations is not None:
+        try:
+            save_station_list(stations)
+        except OSError as e:
+            logger.error("Failed to save station list.", error=str(e))
+    elif SNAPSHOT_FILE.exists():
+        logger.warn("Keeping previous station snapshot.")
+        return
+    else:
+        try:
+            with open(STATIONS_FILE, "r", encoding='utf-8') as f:
+                stations = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error("No station data available to publish.", error=str(e))
+            return
+    try:
+        version = write_snapshot(stations, SNAPSHOT_FILE)
+    except OSError as e:
+        logger.error("Failed to publish station snapshot.", error=str(e))
+        return
+    logger.info("Published station snapshot.", version=version, count=len(stations))
+
+
+class StationSnapshot:
+    """
+    Pembaca file snapshot stasiun berversi untuk proses worker.
+    File hanya dibaca dan di-parse ulang jika versinya berubah; setiap worker menyimpan salinan hasil parse sendiri.
+    """
+    def __init__(self, path: Path = SNAPSHOT_FILE, check_interval: float = settings.STATION_SNAPSHOT_CHECK_INTERVAL):
+        self._path = path
+        self._check_interval = check_interval
+        self._next_check = 0.0
+        self._file_stamp = None
+        self.version = 0
+
+    def refresh(self, force: bool = False) -> Optional[List[Dict]]:
+        """
+        Memeriksa snapshot di disk. Mengembalikan daftar stasiun jika ada versi baru, None jika tidak berubah.
+        Pemeriksaan dibatasi sekali per `check_interval` detik kecuali `force=True`.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return None
+        self._next_check = now + self._check_interval
+
+        try:
+            st = os.stat(self._path)
+        except FileNotFoundError:
+            return None
+        file_stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if file_stamp == self._file_stamp:
+            return None
+
+        with open(self._path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Invalid station snapshot: {self._path}")
+        magic, version, length = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or _HEADER.size + length > len(data):
+            raise ValueError(f"Invalid station snapshot: {self._path}")
+        self._file_stamp = file_stamp
+        if version == self.version:
+            return None
+        stations = json.loads(data[_HEADER.size:_HEADER.size + length])
+        self.version = version
+        return stations
+
+
+def _stop_if_orphaned(scheduler, parent_pid: int):
+    """
+    Hentikan updater jika proses leader (master gunicorn) sudah tidak ada.
+    """
+    if os.getppid() != parent_pid:
+        logger.warn("Leader process is gone. Stopping station updater.")
+        scheduler.shutdown(wait=False)
+
+
+def _retry_if_unpublished():
+    """
+    Coba terbitkan ulang selama snapshot belum ada (misal fetch saat boot gagal),
+    agar worker tidak melayani daftar kosong sampai jadwal update berikutnya.
+    """
+    if not SNAPSHOT_FILE.exists():
+        publish_station_snapshot()
+
+
+def run_station_updater(parent_pid: int):
+    """
+    Entry point proses updater terpisah yang dijalankan leader (lihat gunicorn.conf.py).
+    Menjalankan satu-satunya scheduler update stasiun di luar proses master, sehingga
+    master tetap single-threaded saat mem-fork worker.
+    """
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from logging_config import setup_logging
+
+    setup_logging(log_level=settings.LOG_LEVEL)
+    scheduler = BlockingScheduler()
+    scheduler.add_job(publish_station_snapshot, 'interval', hours=settings.STATION_UPDATE_INTERVAL_HOURS)
+    scheduler.add_job(_retry_if_unpublished, 'interval', minutes=settings.STATION_RETRY_INTERVAL_MINUTES)
+    scheduler.add_job(_stop_if_orphaned, 'interval', minutes=1, args=[scheduler, parent_pid])
+    logger.info("Station updater started.", interval_hours=settings.STATION_UPDATE_INTERVAL_HOURS)
+    scheduler.start()
@@ -0,0 +1,162 @@
+import json
+import sys
+
+import pytest
+
+import station_snapshot
+from config import settings
+from station_snapshot import StationSnapshot, write_snapshot
+
+STATIONS_V1 = [{"code": "GMR", "name": "GAMBIR", "city": "GAMBIR", "cityname": "JAKARTA"}]
+STATIONS_V2 = STATIONS_V1 + [{"code": "BD", "name": "BANDUNG", "city": "BANDUNG", "cityname": "BANDUNG"}]
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return tmp_path / "stations.snapshot"
+
+
+@pytest.fixture
+def station_manager_module(monkeypatch):
+    """
+    Impor station_manager dalam peran worker agar instance global tidak melakukan scraping.
+    Modul dikeluarkan lagi dari sys.modules jika sebelumnya belum dimuat.
+    """
+    already_loaded = "station_manager" in sys.modules
+    monkeypatch.setattr(settings, "STATION_ROLE", "worker")
+    import station_manager
+    yield station_manager
+    if not already_loaded:
+        sys.modules.pop("station_manager", None)
+
+
+@pytest.fixture
+def leader_files(monkeypatch, tmp_path):
+    """Arahkan stations.json dan snapshot leader ke direktori sementara."""
+    stations_file = tmp_path / "stations.json"
+    snapshot_file = tmp_path / "stations.snapshot"
+    monkeypatch.setattr(station_snapshot, "STATIONS_FILE", stations_file)
+    monkeypatch.setattr(station_snapshot, "SNAPSHOT_FILE", snapshot_file)
+    return stations_file, snapshot_file
+
+
+# =====================
+# Test snapshot (tulis & baca)
+# =====================
+def test_snapshot_round_trip_and_version_bump(snapshot_path):
+    """Snapshot yang ditulis terbaca kembali, dan versi naik setiap kali diterbitkan."""
+    reader = StationSnapshot(snapshot_path, check_interval=0)
+    assert reader.refresh() is None
+
+    assert write_snapshot(STATIONS_V1, snapshot_path) == 1
+    assert reader.refresh() == STATIONS_V1
+    assert reader.version == 1
+
+    assert write_snapshot(STATIONS_V2, snapshot_path) == 2
+    assert reader.refresh() == STATIONS_V2
+    assert reader.version == 2
+
+
+def test_snapshot_unchanged_returns_none(snapshot_path):
+    """File yang tidak berubah tidak di-parse ulang."""
+    write_snapshot(STATIONS_V1, snapshot_path)
+    reader = StationSnapshot(snapshot_path, check_interval=0)
+    assert reader.refresh() == STATIONS_V1
+    assert reader.refresh() is None
+    assert reader.refresh(force=True) is None
+
+
+@pytest.mark.parametrize("content", [b"", b"not a snapshot at all"])
+def test_snapshot_corrupt_raises_value_error(snapshot_path, content):
+    """Snapshot kosong atau rusak menghasilkan ValueError."""
+    snapshot_path.write_bytes(content)
+    with pytest.raises(ValueError):
+        StationSnapshot(snapshot_path, check_interval=0).refresh()
+
+
+# =====================
+# Test publish snapshot oleh leader
+# =====================
+def test_publish_failed_fetch_keeps_existing_snapshot(monkeypatch, leader_files):
+    """Fetch gagal tidak menimpa snapshot yang sudah ada."""
+    _, snapshot_file = leader_files
+    write_snapshot(STATIONS_V1, snapshot_file)
+    monkeypatch.setattr(station_snapshot, "fetch_station_list", lambda: None)
+
+    station_snapshot.publish_station_snapshot()
+
+    reader = StationSnapshot(snapshot_file, check_interval=0)
+    assert reader.refresh() == STATIONS_V1
+    assert reader.version == 1
+
+
+def test_publish_failed_fetch_falls_back_to_stations_json(monkeypatch, leader_files):
+    """Fetch gagal tanpa snapshot: snapshot dibuat dari stations.json lokal."""
+    stations_file, snapshot_file = leader_files
+    stations_file.write_text(json.dumps(STATIONS_V1), encoding="utf-8")
+    monkeypatch.setattr(station_snapshot, "fetch_station_list", lambda: None)
+
+    station_snapshot.publish_station_snapshot()
+
+    assert StationSnapshot(snapshot_file, check_interval=0).refresh() == STATIONS_V1
+
+
+def test_publish_survives_failed_save(monkeypatch, leader_files, tmp_path):
+    """Data baru tetap diterbitkan walau stations.json gagal ditulis."""
+    _, snapshot_file = leader_files
+    monkeypatch.setattr(station_snapshot, "STATIONS_FILE", tmp_path / "missing" / "stations.json")
+    monkeypatch.setattr(station_snapshot, "fetch_station_list", lambda: STATIONS_V2)
+
+    station_snapshot.publish_station_snapshot()
+
+    assert StationSnapshot(snapshot_file, check_interval=0).refresh() == STATIONS_V2
+
+
+def test_retry_only_runs_while_snapshot_missing(monkeypatch, leader_files):
+    """Retry updater hanya scraping ulang selama snapshot belum ada."""
+    _, snapshot_file = leader_files
+    calls = []
+    monkeypatch.setattr(station_snapshot, "fetch_station_list", lambda: calls.append(1) or STATIONS_V1)
+
+    station_snapshot._retry_if_unpublished()
+    assert snapshot_file.exists()
+    station_snapshot._retry_if_unpublished()
+    assert len(calls) == 1
+
+
+# =====================
+# Test StationManager peran worker
+# =====================
+def _worker_manager(module, monkeypatch, snapshot_path):
+    def fail_fetch():
+        raise AssertionError("worker must not fetch the station list")
+
+    monkeypatch.setattr(module, "fetch_station_list", fail_fetch)
+    monkeypatch.setattr(module, "StationSnapshot", lambda: StationSnapshot(snapshot_path, check_interval=0))
+    return module.StationManager(role="worker")
+
+
+def test_worker_reads_snapshot_without_fetching(station_manager_module, monkeypatch, snapshot_path):
+    """Worker hanya membaca snapshot dan memuat ulang saat versinya berubah, tanpa scraping."""
+    manager = _worker_manager(station_manager_module, monkeypatch, snapshot_path)
+    assert manager.get_all_stations() == []
+    manager.update_station_list()
+
+    write_snapshot(STATIONS_V1, snapshot_path)
+    assert manager.is_valid_station("gmr")
+    assert not manager.is_valid_station("BD")
+
+    write_snapshot(STATIONS_V2, snapshot_path)
+    manager.update_station_list()
+    assert [s["code"] for s in manager.search_stations("bandung")] == ["BD"]
+
+
+def test_worker_keeps_data_on_corrupt_snapshot(station_manager_module, monkeypatch, snapshot_path):
+    """Snapshot rusak dicatat ke log oleh _sync_snapshot, data lama tetap dipakai."""
+    write_snapshot(STATIONS_V1, snapshot_path)
+    manager = _worker_manager(station_manager_module, monkeypatch, snapshot_path)
+    assert manager.get_all_stations() == STATIONS_V1
+
+    snapshot_path.write_bytes(b"")
+    assert manager.get_all_stations() == STATIONS_V1
+    assert manager.is_valid_station("GMR")